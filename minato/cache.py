@@ -6,12 +6,13 @@ import hashlib
 import json
 import logging
 import os
-import uuid
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from enum import Enum
 from os import PathLike
 from pathlib import Path
-from typing import Any, Dict, Iterator, List, Optional, Union
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union, cast
 
 from minato.common import FileLock
 from minato.exceptions import CacheAlreadyExists, CacheNotFoundError, ConfigurationError
@@ -20,6 +21,9 @@ from minato.util import remove_file_or_directory
 logger = logging.getLogger(__name__)
 
 
+_DATACLASS_OPTIONS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
 class CacheStatus(Enum):
     PENDING = "PENDING"
     DOWNLOADING = "DOWNLOADING"
@@ -29,55 +33,52 @@ class CacheStatus(Enum):
     DELETED = "DELETED"
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(**_DATACLASS_OPTIONS)
 class CachedFile:
     uid: str
     url: str
     local_path: Path
     created_at: datetime.datetime
     updated_at: datetime.datetime
-    expire_days: int
-    extraction_path: Optional[Path]
-    status: CacheStatus
-    version: Optional[str]
-    auto_update: bool
-
-    def __init__(
-        self,
-        uid: str,
-        url: str,
-        local_path: Union[str, PathLike],
-        created_at: Union[str, datetime.datetime],
-        updated_at: Union[str, datetime.datetime],
-        expire_days: int = -1,
-        extraction_path: Optional[Union[str, PathLike]] = None,
-        status: Union[str, CacheStatus] = CacheStatus.PENDING,
-        version: Optional[str] = None,
-        auto_update: bool = True,
-    ) -> None:
+    expire_days: int = -1
+    extraction_path: Optional[Path] = None
+    status: CacheStatus = CacheStatus.PENDING
+    version: Optional[str] = None
+    auto_update: bool = True
+
+    def __post_init__(self) -> None:
+        # The constructor also accepts the loose types of the JSON metadata,
+        # so widen the declared field types before converting them.
+        local_path = cast(Union[str, PathLike], self.local_path)
         if not isinstance(local_path, Path):
             local_path = Path(local_path)
+        self.local_path = local_path.absolute()
+        created_at = cast(Union[str, datetime.datetime], self.created_at)
         if isinstance(created_at, str):
-            created_at = datetime.datetime.fromisoformat(created_at)
+            self.created_at = datetime.datetime.fromisoformat(created_at)
+        updated_at = cast(Union[str, datetime.datetime], self.updated_at)
         if isinstance(updated_at, str):
-            updated_at = datetime.datetime.fromisoformat(updated_at)
+            self.updated_at = datetime.datetime.fromisoformat(updated_at)
+        extraction_path = cast(Optional[Union[str, PathLike]], self.extraction_path)
         if extraction_path is not None:
             if not isinstance(extraction_path, Path):
                 extraction_path = Path(extraction_path)
-            extraction_path = extraction_path.absolute()
+            self.extraction_path = extraction_path.absolute()
+        status = cast(Union[str, CacheStatus], self.status)
         if isinstance(status, str):
-            status = CacheStatus(status)
-
-        self.uid = uid
-        self.url = url
-        self.local_path = local_path.absolute()
-        self.created_at = created_at
-        self.updated_at = updated_at
-        self.expire_days = expire_days
-        self.extraction_path = extraction_path
-        self.status = status
-        self.version = version
-        self.auto_update = auto_update
+            self.status = CacheStatus(status)
+
+    @classmethod
+    def from_dict(cls, params: Dict[str, Any]) -> CachedFile:
+        params = dict(params)
+        params["local_path"] = Path(params["local_path"])
+        params["created_at"] = datetime.datetime.fromisoformat(params["created_at"])
+        params["updated_at"] = datetime.datetime.fromisoformat(params["updated_at"])
+        if params.get("extraction_path") is not None:
+            params["extraction_path"] = Path(params["extraction_path"])
+        if "status" in params:
+            params["status"] = CacheStatus(params["status"])
+        return cls(**params)
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -101,19 +102,28 @@ class Cache:
         default_expire_days: int = -1,
         default_auto_update: bool = True,
     ) -> None:
-        root = Path(root)
+        self._root = Path(root).absolute()
+        self._root_prepared = False
+        self._default_expire_days = default_expire_days
+        self._default_auto_update = default_auto_update
+        self._uid_by_url: Dict[str, str] = {}
 
-        if not root.exists():
-            os.makedirs(root, exist_ok=True)
+    def _prepare_root(self) -> None:
+        if self._root_prepared:
+            return
 
-        if not root.is_dir():
-            raise ConfigurationError(f"Given cache_directory path is not a directory: {root}")
+        if not self._root.exists():
+            os.makedirs(self._root, exist_ok=True)
 
-        self._root = root
-        self._default_expire_days = default_expire_days
-        self._default_auto_update = default_auto_update
+        if not self._root.is_dir():
+            raise ConfigurationError(f"Given cache_directory path is not a directory: {self._root}")
+
+        self._root_prepared = True
 
     def __contains__(self, url: str) -> bool:
+        uid = self._uid_by_url.get(url)
+        if uid is not None and self.get_metadata_path(uid).exists():
+            return True
         try:
             self.by_url(url)
             return True
@@ -122,6 +132,7 @@ class Cache:
 
     @contextmanager
     def lock(self, item: CachedFile) -> Iterator[None]:
+        self._prepare_root()
         lock = FileLock(self.get_lockfile_path(item.uid))
         try:
             logger.debug("Trying to acquire file lock of %s.", item.url)
@@ -134,8 +145,8 @@ class Cache:
     @staticmethod
     def _generate_uid(url: str) -> str:
         hashval = hashlib.md5(url.encode()).hexdigest()
-        uuidval = uuid.uuid4().hex
-        return f"{hashval}-{uuidval}"
+        randval = os.urandom(16).hex()
+        return f"{hashval}-{randval}"
 
     def get_metadata_path(self, uid: str) -> Path:
         return self._root / (uid + ".json")
@@ -143,12 +154,18 @@ class Cache:
     def get_lockfile_path(self, uid: str) -> Path:
         return self._root / (uid + ".lock")
 
-    def load_cached_file(self, metadata_path: Path) -> CachedFile:
-        if not metadata_path.exists():
+    def _list_metadata_filenames(self) -> List[str]:
+        self._prepare_root()
+        return [filename for filename in os.listdir(self._root) if filename.endswith(".json")]
+
+    def load_cached_file(self, metadata_path: Union[str, PathLike]) -> CachedFile:
+        self._prepare_root()
+        try:
+            with open(metadata_path, "r") as fp:
+                params = json.load(fp)
+        except FileNotFoundError:
             raise CacheNotFoundError(f"Cache not found: {metadata_path}")
-        with open(metadata_path, "r") as fp:
-            params = json.load(fp)
-        return CachedFile(**params)
+        return CachedFile.from_dict(params)
 
     def new(self, url: str) -> CachedFile:
         uid = self._generate_uid(url)
@@ -164,10 +181,12 @@ class Cache:
         return cached_file
 
     def exists(self, item: CachedFile) -> bool:
+        self._prepare_root()
         metadata_path = self.get_metadata_path(item.uid)
         return metadata_path.exists()
 
     def save(self, item: CachedFile) -> None:
+        self._prepare_root()
         metadata_path = self.get_metadata_path(item.uid)
         with open(metadata_path, "w") as fp:
             json.dump(item.to_dict(), fp)
@@ -176,31 +195,68 @@ class Cache:
         if self.exists(item):
             raise CacheAlreadyExists(item.url)
         self.save(item)
+        self._uid_by_url[item.url] = item.uid
         logger.debug("New cached file of %s was added.", item.url)
         return item
 
+    def add_many(self, urls: Iterable[str]) -> List[CachedFile]:
+        unique_urls = list(dict.fromkeys(urls))
+        filenames_by_hashval: Dict[str, List[str]] = {}
+        for filename in self._list_metadata_filenames():
+            filenames_by_hashval.setdefault(filename.split("-", 1)[0], []).append(filename)
+
+        for url in unique_urls:
+            hashval = hashlib.md5(url.encode()).hexdigest()
+            for filename in filenames_by_hashval.get(hashval, []):
+                cached_file = self.load_cached_file(os.path.join(self._root, filename))
+                if cached_file.url == url:
+                    raise CacheAlreadyExists(url)
+
+        items = [self.new(url) for url in unique_urls]
+        for item in items:
+            self.save(item)
+            self._uid_by_url[item.url] = item.uid
+        logger.debug("%d new cached files were added.", len(items))
+        return items
+
     def update(self, item: CachedFile) -> None:
+        self._prepare_root()
         metadata_path = self.get_metadata_path(item.uid)
-        if not metadata_path.exists():
+        try:
+            # Opening with "r+" fails if the metadata was removed, so a concurrent
+            # delete cannot be undone by recreating the file.
+            with open(metadata_path, "r+") as fp:
+                item.updated_at = datetime.datetime.now()
+                fp.truncate()
+                json.dump(item.to_dict(), fp)
+        except FileNotFoundError:
             raise CacheNotFoundError(f"Cache not found with uid={item.uid}")
-        item.updated_at = datetime.datetime.now()
-        self.save(item)
 
     def by_uid(self, uid: str) -> CachedFile:
-        metadata_path = self.get_metadata_path(uid)
-        if not metadata_path.exists():
+        try:
+            return self.load_cached_file(self.get_metadata_path(uid))
+        except CacheNotFoundError:
             raise CacheNotFoundError(f"Cache not found with uid={uid}")
-        with open(metadata_path, "r") as fp:
-            params = json.load(fp)
-        return CachedFile(**params)
 
     def by_url(self, url: str) -> CachedFile:
         logger.debug("Try to find cached file of %s", url)
+        uid = self._uid_by_url.get(url)
+        if uid is not None:
+            try:
+                return self.by_uid(uid)
+            except CacheNotFoundError:
+                del self._uid_by_url[url]
+
         hashval = hashlib.md5(url.encode()).hexdigest()
-        for metadata_path in self._root.glob(f"{hashval}-*.json"):
-            cached_file = self.load_cached_file(metadata_path)
+        prefix = f"{hashval}-"
+        metadata_filenames = self._list_metadata_filenames()
+        for filename in metadata_filenames:
+            if not filename.startswith(prefix):
+                continue
+            cached_file = self.load_cached_file(os.path.join(self._root, filename))
             if cached_file.url == url:
                 logger.debug("Find cached file of %s: %s", url, cached_file.local_path)
+                self._uid_by_url[url] = cached_file.uid
                 return cached_file
 
         logger.debug(
@@ -209,39 +265,59 @@ class Cache:
             self._root,
         )
 
-        for cached_file in self.all():
+        for filename in metadata_filenames:
+            if filename.startswith(prefix):
+                continue
+            cached_file = self.load_cached_file(os.path.join(self._root, filename))
             if cached_file.url == url:
+                self._uid_by_url[url] = cached_file.uid
                 return cached_file
         raise CacheNotFoundError(f"Cache not found with url={url}")
 
     def delete(self, item: CachedFile) -> None:
+        self._prepare_root()
         metadata_path = self.get_metadata_path(item.uid)
         lockfile_path = self.get_lockfile_path(item.uid)
+        if self._uid_by_url.get(item.url) == item.uid:
+            self._uid_by_url.pop(item.url, None)
 
         remove_file_or_directory(item.local_path)
         if item.extraction_path is not None:
             remove_file_or_directory(item.extraction_path)
 
-        remove_file_or_directory(metadata_path)
-        remove_file_or_directory(lockfile_path)
+        for path in (metadata_path, lockfile_path):
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
         logger.debug("A cached file of %s was successfully deleted.", item.url)
 
-    def is_expired(self, item: CachedFile) -> bool:
+    def delete_many(self, items: Iterable[CachedFile]) -> None:
+        items = list(items)
+        if not items:
+            return
+
+        def _delete(item: CachedFile) -> None:
+            with self.lock(item):
+                self.delete(item)
+
+        with ThreadPoolExecutor(max_workers=min(32, len(items))) as executor:
+            list(executor.map(_delete, items))
+
+    def is_expired(self, item: CachedFile, now: Optional[datetime.datetime] = None) -> bool:
         if item.expire_days < 0:
             return False
-        now = datetime.datetime.now()
+        if now is None:
+            now = datetime.datetime.now()
         delta = now - item.updated_at
         return delta.days >= item.expire_days
 
+    def iter(self) -> Iterator[CachedFile]:
+        for filename in self._list_metadata_filenames():
+            yield self.load_cached_file(os.path.join(self._root, filename))
+
     def all(self) -> List[CachedFile]:
-        cached_files: List[CachedFile] = []
-        for metafile_path in self._root.glob("*.json"):
-            with open(metafile_path, "r") as fp:
-                params = json.load(fp)
-                cached_file = CachedFile(**params)
-            cached_files.append(cached_file)
-        cached_files = sorted(cached_files, key=lambda x: x.created_at)
-        return cached_files
+        return sorted(self.iter(), key=lambda x: x.created_at)
 
     def filter(
         self,
@@ -250,16 +326,16 @@ class Cache:
         failed: Optional[bool] = None,
         completed: Optional[bool] = None,
     ) -> List[CachedFile]:
-        cached_files = self.all()
-        for query in queries:
-            cached_files = [x for x in cached_files if query in x.url or x.uid.startswith(query)]
-        if expired is not None:
-            cached_files = [x for x in cached_files if self.is_expired(x) == expired]
-        if failed is not None:
-            cached_files = [x for x in cached_files if (x.status == CacheStatus.FAILED) == failed]
-        if completed is not None:
-            cached_files = [x for x in cached_files if (x.status == CacheStatus.COMPLETED) == completed]
-
-        unique_caches = {x.uid: x for x in cached_files}
-        cached_files = sorted(unique_caches.values(), key=lambda x: x.created_at)
-        return cached_files
+        now = datetime.datetime.now()
+        unique_caches: Dict[str, CachedFile] = {}
+        for cached_file in self.iter():
+            if not all(query in cached_file.url or cached_file.uid.startswith(query) for query in queries):
+                continue
+            if expired is not None and self.is_expired(cached_file, now) != expired:
+                continue
+            if failed is not None and (cached_file.status == CacheStatus.FAILED) != failed:
+                continue
+            if completed is not None and (cached_file.status == CacheStatus.COMPLETED) != completed:
+                continue
+            unique_caches[cached_file.uid] = cached_file
+        return sorted(unique_caches.values(), key=lambda x: x.created_at)
@@ -95,6 +95,7 @@ class ListCommand(Subcommand):
             columns.append("extraction_path")
 
         table = Table(columns=columns, shrink=not args.no_shrink)
+        now = datetime.datetime.now()
 
         for cached_file in cached_files:
             info = cached_file.to_dict()
@@ -106,12 +107,11 @@ class ListCommand(Subcommand):
             else:
                 info["size"] = "-"
 
-            if cache.is_expired(cached_file):
+            if cache.is_expired(cached_file, now):
                 info["expire_days"] = f"EXPIRED({cached_file.expire_days})"
             elif cached_file.expire_days < 0:
                 info["expire_days"] = "NONE"
             else:
-                now = datetime.datetime.now()
                 delta = now - cached_file.updated_at
                 info["expire_days"] = f"{delta.days}/{cached_file.expire_days}"
 
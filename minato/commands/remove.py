@@ -68,9 +68,9 @@ class RemoveCommand(Subcommand):
             print("No files to delete")
             return
 
-        print(f"{num_caches} files will be deleted:")
-        for cached_file in cached_files:
-            print(f"  [{cached_file.uid[:8]}] {cached_file.url}")
+        lines = [f"{num_caches} files will be deleted:"]
+        lines.extend(f"  [{cached_file.uid[:8]}] {cached_file.url}" for cached_file in cached_files)
+        print("\n".join(lines))
 
         if not args.force:
             yes_or_not = input("Delete these caches? y/[n]: ")
@@ -78,8 +78,6 @@ class RemoveCommand(Subcommand):
                 print("canceled")
                 return
 
-        for cached_file in cached_files:
-            with cache.lock(cached_file):
-                cache.delete(cached_file)
+        cache.delete_many(cached_files)
 
         print("Cache files were successfully deleted.")
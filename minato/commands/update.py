@@ -91,9 +91,9 @@ class UpdateCommand(Subcommand):
             print("No caches to update.")
             return
 
-        print(f"{num_caches} files will be updated:")
-        for cached_file in cached_files:
-            print(f"  [{cached_file.uid[:8]}] {cached_file.url}")
+        lines = [f"{num_caches} files will be updated:"]
+        lines.extend(f"  [{cached_file.uid[:8]}] {cached_file.url}" for cached_file in cached_files)
+        print("\n".join(lines))
 
         if not args.force:
             yes_or_no = input("Are you sure to update these caches? y/[n]:")
@@ -1,15 +1,28 @@
 from __future__ import annotations
 
 import dataclasses
+import os
 from configparser import ConfigParser
 from os import PathLike
 from pathlib import Path
+from typing import Tuple
 
 MINATO_ROOT = Path.home() / ".minato"
 DEFAULT_CACHE_ROOT = MINATO_ROOT / "cache"
 ROOT_CONFIG_PATH = MINATO_ROOT / "config.ini"
 LOCAL_CONFIG_PATH = Path.cwd() / "minato.ini"
 
+_FileState = Tuple[str, int, int, int]
+_LOADED_CONFIGS: dict[tuple[_FileState, ...], Config] = {}
+
+
+def _get_file_state(path: str | PathLike) -> _FileState:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return (os.fspath(path), 0, 0, 0)
+    return (os.fspath(path), stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
 
 @dataclasses.dataclass
 class Config:
@@ -29,8 +42,15 @@ class Config:
         if files is None:
             files = [ROOT_CONFIG_PATH, LOCAL_CONFIG_PATH]
 
-        config = cls()
-        config.read_files(files)
+        key = tuple(_get_file_state(path) for path in files)
+        loaded_config = _LOADED_CONFIGS.get(key)
+        if loaded_config is None:
+            loaded_config = cls()
+            loaded_config.read_files([path for path, (_, _, _, inode) in zip(files, key) if inode != 0])
+            _LOADED_CONFIGS.clear()
+            _LOADED_CONFIGS[key] = loaded_config
+
+        config = dataclasses.replace(loaded_config)
         if cache_root is not None:
             config.cache_root = Path(cache_root)
         if expire_days is not None:
@@ -41,8 +61,11 @@ class Config:
         return config
 
     def read_files(self, files: list[str | PathLike]) -> None:
+        if not files:
+            return
+
         parser = ConfigParser()
-        parser.read([str(path) for path in files])
+        parser.read(files)
         self._update_from_configparser(parser)
 
     def _update_from_configparser(self, parser: ConfigParser) -> None:
@@ -1,10 +1,11 @@
+import datetime
 import tempfile
 from pathlib import Path
 
 import pytest
 
-from minato.cache import Cache
-from minato.exceptions import CacheNotFoundError
+from minato.cache import Cache, CachedFile, CacheStatus
+from minato.exceptions import CacheAlreadyExists, CacheNotFoundError, ConfigurationError
 
 
 def test_cache_add_list_and_delete() -> None:
@@ -39,3 +40,157 @@ def test_cache_contains() -> None:
         _ = cache.add(cache.new(url))
 
         assert url in cache
+
+
+def test_cache_add_many() -> None:
+    with tempfile.TemporaryDirectory() as _tempdir:
+        tempdir = Path(_tempdir)
+        cache = Cache(root=tempdir)
+
+        urls = [f"https://example.com/path/to/file_{i}" for i in range(3)]
+        cached_files = cache.add_many(urls)
+
+        assert [x.url for x in cached_files] == urls
+        assert all(url in cache for url in urls)
+        assert len(cache.all()) == 3
+
+
+def test_cache_add_many_with_duplicated_urls() -> None:
+    with tempfile.TemporaryDirectory() as _tempdir:
+        tempdir = Path(_tempdir)
+        cache = Cache(root=tempdir)
+
+        cached_files = cache.add_many(["https://example.com/file_1", "https://example.com/file_2"] * 2)
+
+        assert [x.url for x in cached_files] == ["https://example.com/file_1", "https://example.com/file_2"]
+        assert [x.url for x in cache.all()] == ["https://example.com/file_1", "https://example.com/file_2"]
+
+
+def test_cache_add_many_with_existing_url() -> None:
+    with tempfile.TemporaryDirectory() as _tempdir:
+        tempdir = Path(_tempdir)
+        cache = Cache(root=tempdir)
+
+        cache.add(cache.new("https://example.com/file_1"))
+
+        with pytest.raises(CacheAlreadyExists):
+            cache.add_many(["https://example.com/file_1", "https://example.com/file_2"])
+        assert [x.url for x in cache.all()] == ["https://example.com/file_1"]
+
+
+def test_cache_update() -> None:
+    with tempfile.TemporaryDirectory() as _tempdir:
+        tempdir = Path(_tempdir)
+        cache = Cache(root=tempdir)
+
+        cached_file = cache.add(cache.new("https://example.com/path/to/file"))
+        cached_file.version = "v2"
+        cache.update(cached_file)
+        assert cache.by_uid(cached_file.uid).version == "v2"
+
+        with cache.lock(cached_file):
+            cache.delete(cached_file)
+
+        with pytest.raises(CacheNotFoundError):
+            cache.update(cached_file)
+        assert not cache.exists(cached_file)
+
+
+def test_cache_by_url_after_delete() -> None:
+    with tempfile.TemporaryDirectory() as _tempdir:
+        tempdir = Path(_tempdir)
+        cache = Cache(root=tempdir)
+
+        url = "https://example.com/path/to/file"
+        cached_file = cache.add(cache.new(url))
+        assert cache.by_url(url).uid == cached_file.uid
+
+        Cache(root=tempdir).delete(cached_file)
+
+        assert url not in cache
+        with pytest.raises(CacheNotFoundError):
+            cache.by_url(url)
+
+
+def test_cache_delete_many() -> None:
+    with tempfile.TemporaryDirectory() as _tempdir:
+        tempdir = Path(_tempdir)
+        cache = Cache(root=tempdir)
+
+        cached_files = cache.add_many(f"https://example.com/path/to/file_{i}" for i in range(3))
+        for cached_file in cached_files:
+            cached_file.local_path.write_text("Hello, world!")
+
+        cache.delete_many(cached_files[:2])
+
+        assert [x.uid for x in cache.all()] == [cached_files[2].uid]
+        assert not cached_files[0].local_path.exists()
+        assert cached_files[2].local_path.exists()
+
+
+def test_cache_filter() -> None:
+    with tempfile.TemporaryDirectory() as _tempdir:
+        tempdir = Path(_tempdir)
+        cache = Cache(root=tempdir)
+
+        cache.add_many(["https://example.com/foo.txt", "https://example.com/bar.txt", "s3://bucket/foo.txt"])
+        cached_file = cache.by_url("https://example.com/foo.txt")
+        cached_file.status = CacheStatus.COMPLETED
+        cache.update(cached_file)
+
+        assert len(list(cache.iter())) == 3
+        assert [x.url for x in cache.filter(["foo"])] == ["https://example.com/foo.txt", "s3://bucket/foo.txt"]
+        assert [x.url for x in cache.filter(["foo", "example"])] == ["https://example.com/foo.txt"]
+        assert [x.url for x in cache.filter([], completed=True)] == ["https://example.com/foo.txt"]
+        assert len(cache.filter([], failed=False)) == 3
+
+
+def test_cache_creates_root_on_first_use() -> None:
+    with tempfile.TemporaryDirectory() as _tempdir:
+        root = Path(_tempdir) / "cache"
+        cache = Cache(root=root)
+        assert not root.exists()
+
+        cache.add(cache.new("https://example.com/path/to/file"))
+        assert root.is_dir()
+        assert len(cache.all()) == 1
+
+
+def test_cache_with_file_as_root() -> None:
+    with tempfile.TemporaryDirectory() as _tempdir:
+        root = Path(_tempdir) / "cache"
+        root.write_text("")
+        cache = Cache(root=root)
+        cached_file = cache.new("https://example.com/path/to/file")
+
+        with pytest.raises(ConfigurationError):
+            cache.by_uid(cached_file.uid)
+        with pytest.raises(ConfigurationError):
+            cache.by_url(cached_file.url)
+        with pytest.raises(ConfigurationError):
+            cache.add(cached_file)
+        with pytest.raises(ConfigurationError):
+            cache.update(cached_file)
+        with pytest.raises(ConfigurationError):
+            cache.delete(cached_file)
+        with pytest.raises(ConfigurationError):
+            cache.all()
+
+
+def test_cached_file_accepts_serialized_values() -> None:
+    cached_file = CachedFile(
+        uid="uid",
+        url="https://example.com/path/to/file",
+        local_path="path/to/file",  # type: ignore[arg-type]
+        created_at="2020-01-01T00:00:00",  # type: ignore[arg-type]
+        updated_at="2020-01-02T00:00:00",  # type: ignore[arg-type]
+        extraction_path="path/to/file-extracted",  # type: ignore[arg-type]
+        status="COMPLETED",  # type: ignore[arg-type]
+    )
+
+    assert cached_file.local_path == Path("path/to/file").absolute()
+    assert cached_file.created_at == datetime.datetime(2020, 1, 1)
+    assert cached_file.updated_at == datetime.datetime(2020, 1, 2)
+    assert cached_file.extraction_path == Path("path/to/file-extracted").absolute()
+    assert cached_file.status == CacheStatus.COMPLETED
+    assert CachedFile.from_dict(cached_file.to_dict()) == cached_file
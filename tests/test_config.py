@@ -0,0 +1,31 @@
+import tempfile
+from pathlib import Path
+
+from minato.config import Config
+
+
+def test_config_load_rereads_modified_file() -> None:
+    with tempfile.TemporaryDirectory() as _tempdir:
+        config_path = Path(_tempdir) / "minato.ini"
+        config_path.write_text("[cache]\nexpire_days = 3\n")
+        assert Config.load(files=[config_path]).expire_days == 3
+
+        config_path.write_text("[cache]\nexpire_days = 10\n")
+        assert Config.load(files=[config_path]).expire_days == 10
+
+
+def test_config_load_overrides_do_not_leak_into_cache() -> None:
+    with tempfile.TemporaryDirectory() as _tempdir:
+        config_path = Path(_tempdir) / "minato.ini"
+        config_path.write_text("[cache]\nroot = /path/to/cache\nexpire_days = 3\n")
+
+        config = Config.load(cache_root=Path(_tempdir), expire_days=7, files=[config_path])
+        assert config.cache_root == Path(_tempdir)
+        assert config.expire_days == 7
+
+        config.auto_update = False
+
+        config = Config.load(files=[config_path])
+        assert config.cache_root == Path("/path/to/cache")
+        assert config.expire_days == 3
+        assert config.auto_update